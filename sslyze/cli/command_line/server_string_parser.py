@@ -18,27 +18,46 @@ class CommandLineServerStringParser:
     """
 
     SERVER_STRING_ERROR_BAD_PORT = "Not a valid host:port"
+    SERVER_STRING_ERROR_BAD_IPV6 = "Not a valid [ipv6]:port"
+    SERVER_STRING_ERROR_BAD_IP = "Not a valid host:port{ip}"
 
     @classmethod
     def parse_server_string(cls, server_str: str) -> Tuple[str, Optional[str], Optional[int]]:
+        ip_sep = server_str.find("{")
+        if ip_sep == -1 and "[" not in server_str:
+            # Fast path for the most common case: a hostname or ipv4 address with an optional port
+            (host, port) = cls._parse_ipv4_server_string(server_str)
+            return host, None, port
+
         # Extract ip from target
+        full_server_str = server_str
         ip = None
-        if "{" in server_str and "}" in server_str:
-            raw_target = server_str.split("{")
-            raw_ip = raw_target[1]
+        if ip_sep != -1:
+            ip_start = ip_sep + 1
+            ip_end = server_str.find("}", ip_start)
+            # No closing brace, extra text after it, or no ip between the braces
+            if ip_end != len(server_str) - 1 or ip_end == ip_start:
+                raise InvalidServerStringError(server_string=server_str, error_message=cls.SERVER_STRING_ERROR_BAD_IP)
 
-            ip = raw_ip.replace("}", "")
+            ip = server_str[ip_start:ip_end]
 
             # Clean the target
-            server_str = raw_target[0]
+            server_str = server_str[:ip_sep]
 
         # Look for ipv6 hint in target
-        if "[" in server_str:
-            (host, port) = cls._parse_ipv6_server_string(server_str)
+        ipv6_sep = server_str.find("[")
+        if ipv6_sep != -1:
+            (host, port) = cls._parse_ipv6_server_string(server_str, ipv6_sep)
         else:
             # Look for ipv6 hint in the ip
-            if ip is not None and "[" in ip:
-                (ip, port) = cls._parse_ipv6_server_string(ip)
+            if ip is not None:
+                ipv6_sep = ip.find("[")
+                if ipv6_sep != -1:
+                    try:
+                        (ip, _) = cls._parse_ipv6_server_string(ip, ipv6_sep)
+                    except InvalidServerStringError as e:
+                        # Report the whole target instead of just the ip
+                        raise InvalidServerStringError(server_string=full_server_str, error_message=e.error_message)
 
             # Fallback to ipv4
             (host, port) = cls._parse_ipv4_server_string(server_str)
@@ -47,30 +66,37 @@ def parse_server_string(cls, server_str: str) -> Tuple[str, Optional[str], Optio
 
     @classmethod
     def _parse_ipv4_server_string(cls, server_str: str) -> Tuple[str, Optional[int]]:
-        host = server_str
         port = None
-        if ":" in server_str:
-            host = (server_str.split(":"))[0]  # hostname or ipv4 address
+        (host, port_sep, port_str) = server_str.rpartition(":")  # hostname or ipv4 address
+        if port_sep:
+            if ":" in host:  # More than one colon; most likely an ipv6 address without brackets
+                raise InvalidServerStringError(server_string=server_str, error_message=cls.SERVER_STRING_ERROR_BAD_IPV6)
             try:
-                port = int((server_str.split(":"))[1])
+                port = int(port_str)
             except ValueError:  # Port is not an int
                 raise InvalidServerStringError(server_string=server_str, error_message=cls.SERVER_STRING_ERROR_BAD_PORT)
+        else:
+            host = server_str
 
         return host, port
 
     @classmethod
-    def _parse_ipv6_server_string(cls, server_str: str) -> Tuple[str, Optional[int]]:
+    def _parse_ipv6_server_string(cls, server_str: str, ipv6_sep: int) -> Tuple[str, Optional[int]]:
         if not socket.has_ipv6:
             raise InvalidServerStringError(
                 server_string=server_str, error_message="IPv6 is not supported on this platform"
             )
 
         port = None
-        target_split = server_str.split("]")
-        ipv6_addr = target_split[0].split("[")[1]
-        if ":" in target_split[1]:  # port was specified
+        ipv6_start = ipv6_sep + 1
+        (ipv6_addr, ipv6_end, port_str) = server_str[ipv6_start:].partition("]")
+        if not ipv6_end:
+            raise InvalidServerStringError(server_string=server_str, error_message=cls.SERVER_STRING_ERROR_BAD_IPV6)
+
+        (_, port_sep, port_str) = port_str.partition(":")
+        if port_sep:  # port was specified
             try:
-                port = int(target_split[1].rsplit(":")[1])
+                port = int(port_str)
             except ValueError:  # Port is not an int
                 raise InvalidServerStringError(server_string=server_str, error_message=cls.SERVER_STRING_ERROR_BAD_PORT)
         return ipv6_addr, port
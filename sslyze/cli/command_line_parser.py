@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from optparse import OptionParser, OptionGroup
+from argparse import ArgumentParser, ArgumentTypeError
 
 from pathlib import Path
+from types import MappingProxyType
 
 from nassl.ssl_client import OpenSslFileTypeEnum
-from typing import Set, List, Optional
+from typing import Mapping, Set, List, Optional
 from typing import Tuple
 
 from sslyze.cli.command_line.server_string_parser import InvalidServerStringError, CommandLineServerStringParser
@@ -62,158 +63,163 @@ class ParsedCommandLine:
     concurrent_server_scans_limit: Optional[int]
 
 
-_STARTTLS_PROTOCOL_DICT = {
-    "smtp": ProtocolWithOpportunisticTlsEnum.SMTP,
-    "xmpp": ProtocolWithOpportunisticTlsEnum.XMPP,
-    "xmpp_server": ProtocolWithOpportunisticTlsEnum.XMPP_SERVER,
-    "pop3": ProtocolWithOpportunisticTlsEnum.POP3,
-    "imap": ProtocolWithOpportunisticTlsEnum.IMAP,
-    "ftp": ProtocolWithOpportunisticTlsEnum.FTP,
-    "ldap": ProtocolWithOpportunisticTlsEnum.LDAP,
-    "rdp": ProtocolWithOpportunisticTlsEnum.RDP,
-    "postgres": ProtocolWithOpportunisticTlsEnum.POSTGRES,
-}
+# The name of each StartTLS protocol on the command line is the lowercase name of its enum member
+_STARTTLS_PROTOCOLS_BY_NAME: Mapping[str, ProtocolWithOpportunisticTlsEnum] = MappingProxyType(
+    {protocol.name.lower(): protocol for protocol in ProtocolWithOpportunisticTlsEnum}
+)
+
+_STARTTLS_CHOICES = ("auto", *_STARTTLS_PROTOCOLS_BY_NAME)
+
+
+_KEY_FORMATS: Mapping[str, OpenSslFileTypeEnum] = MappingProxyType(
+    {"DER": OpenSslFileTypeEnum.ASN1, "PEM": OpenSslFileTypeEnum.PEM}
+)
+
+
+# Defines what --regular means
+_REGULAR_CMD = (
+    "sslv2",
+    "sslv3",
+    "tlsv1",
+    "tlsv1_1",
+    "tlsv1_2",
+    "tlsv1_3",
+    "reneg",
+    "resum",
+    "certinfo",
+    "hide_rejected_ciphers",
+    "compression",
+    "heartbleed",
+    "openssl_ccs",
+    "fallback",
+    "robot",
+)
+
+_REGULAR_CMD_ENABLED: Mapping[str, bool] = MappingProxyType(dict.fromkeys(_REGULAR_CMD, True))
+
+
+def _parse_https_tunnel_url(proxy_url: str) -> HttpProxySettings:
+    """Validate and parse the proxy URL supplied via --https_tunnel.
+    """
+    try:
+        return HttpProxySettings.from_url(proxy_url)
+    except ValueError as e:
+        raise ArgumentTypeError("invalid proxy URL: {}".format(e.args[0]))
 
 
 class CommandLineParser:
-    # Defines what --regular means
-    REGULAR_CMD = [
-        "sslv2",
-        "sslv3",
-        "tlsv1",
-        "tlsv1_1",
-        "tlsv1_2",
-        "tlsv1_3",
-        "reneg",
-        "resum",
-        "certinfo",
-        "hide_rejected_ciphers",
-        "compression",
-        "heartbleed",
-        "openssl_ccs",
-        "fallback",
-        "robot",
-    ]
-
-    SSLYZE_USAGE = "usage: %prog [options] target1.com target2.com:443 target3.com:443{ip} etc..."
+    SSLYZE_USAGE = "%(prog)s [options] target1.com target2.com:443 target3.com:443{ip} etc..."
 
     START_TLS_USAGE = (
         "StartTLS should be one of: auto, {}. The 'auto' option will cause SSLyze to deduce the protocol "
         "(ftp, imap, etc.) from the supplied port number, "
-        "for each target servers.".format(", ".join(_STARTTLS_PROTOCOL_DICT.keys()))
+        "for each target servers.".format(", ".join(_STARTTLS_PROTOCOLS_BY_NAME))
     )
 
     def __init__(self, sslyze_version: str) -> None:
         """Generate SSLyze's command line parser.
         """
-        self._parser = OptionParser(version=sslyze_version, usage=self.SSLYZE_USAGE)
+        self._parser = ArgumentParser(usage=self.SSLYZE_USAGE)
+        self._parser.add_argument("--version", action="version", version=sslyze_version)
+        self._parser.add_argument("targets", nargs="*", metavar="target", help="The server(s) to scan.")
 
         # Add generic command line options to the parser
         self._add_default_options()
 
         # Add plugin .ie scan command options to the parser
-        scan_commands_group = OptionGroup(self._parser, "Scan commands", "")
+        scan_commands_group = self._parser.add_argument_group("Scan commands", "")
         for option in self._get_plugin_scan_commands():
-            scan_commands_group.add_option(f"--{option.option}", help=option.help, action=option.action)
-        self._parser.add_option_group(scan_commands_group)
+            scan_commands_group.add_argument(f"--{option.option}", help=option.help, action=option.action)
 
         # Add the --regular command line parameter as a shortcut if possible
-        self._parser.add_option(
-            "--regular",
-            action="store_true",
-            dest=None,
-            help=f"Regular HTTPS scan; shortcut for --{'--'.join(self.REGULAR_CMD)}",
+        self._parser.add_argument(
+            "--regular", action="store_true", help=f"Regular HTTPS scan; shortcut for --{'--'.join(_REGULAR_CMD)}",
         )
 
     def parse_command_line(self) -> ParsedCommandLine:
         """Parses the command line used to launch SSLyze.
         """
-        (args_command_list, args_target_list) = self._parser.parse_args()
+        # Options and targets can be supplied in any order
+        args_command_list = vars(self._parser.parse_intermixed_args())
+        args_target_list: List[str] = args_command_list["targets"]
 
-        if args_command_list.update_trust_stores:
+        if args_command_list["update_trust_stores"]:
             # Just update the trust stores and do nothing
             TrustStoresRepository.update_default()
             raise TrustStoresUpdateCompleted()
 
+        # Options that are checked more than once below
+        targets_in = args_command_list["targets_in"]
+        json_file = args_command_list["json_file"]
+        quiet = args_command_list["quiet"]
+        cert = args_command_list["cert"]
+        key = args_command_list["key"]
+        http_proxy_settings: Optional[HttpProxySettings] = args_command_list["https_tunnel"]
+        starttls = args_command_list["starttls"]
+
         # Handle the --targets_in command line and fill args_target_list
-        if args_command_list.targets_in:
+        if targets_in:
             if args_target_list:
                 raise CommandLineParsingError("Cannot use --targets_list and specify targets within the command line.")
 
             try:  # Read targets from a file
-                with open(args_command_list.targets_in) as f:
-                    for target in f.readlines():
-                        if target.strip():  # Ignore empty lines
-                            if not target.startswith("#"):  # Ignore comment lines
-                                args_target_list.append(target.strip())
+                with open(targets_in, encoding="utf-8") as f:
+                    for line in f:
+                        target = line.strip()
+                        if target and target[0] != "#":  # Ignore empty lines and comment lines
+                            args_target_list.append(target)
             except IOError:
-                raise CommandLineParsingError(
-                    "Can't read targets from input file '{}.".format(args_command_list.targets_in)
-                )
+                raise CommandLineParsingError("Can't read targets from input file '{}.".format(targets_in))
+            except UnicodeDecodeError:
+                raise CommandLineParsingError("Input file '{}' should be encoded in UTF-8.".format(targets_in))
 
         if not args_target_list:
             raise CommandLineParsingError("No targets to scan.")
 
         # Handle the case when no scan commands have been specified: run --regular by default
-        enabled_scan_commands = [
-            getattr(args_command_list, option.option)
-            for option in self._get_plugin_scan_commands()
-            if getattr(args_command_list, option.option)
-        ]
-        if not enabled_scan_commands:
-            if self._parser.has_option("--regular"):
-                setattr(args_command_list, "regular", True)
+        if not any(args_command_list[option.option] for option in self._get_plugin_scan_commands()):
+            args_command_list["regular"] = True
 
         # Handle the --regular command line parameter as a shortcut to a bunch of commands
-        if self._parser.has_option("--regular"):
-            if getattr(args_command_list, "regular"):
-                setattr(args_command_list, "regular", False)
-                for cmd in self.REGULAR_CMD:
-                    setattr(args_command_list, cmd, True)
+        if args_command_list["regular"]:
+            args_command_list["regular"] = False
+            args_command_list.update(_REGULAR_CMD_ENABLED)
 
         # Handle JSON settings
-        should_print_json_to_console = False
+        should_print_json_to_console = json_file == "-"
+        if should_print_json_to_console and quiet:
+            raise CommandLineParsingError("Cannot use --quiet with --json_out -.")
+
         json_path_out: Optional[Path] = None
-        if args_command_list.json_file:
-            if args_command_list.json_file == "-":
-                if args_command_list.quiet:
-                    raise CommandLineParsingError("Cannot use --quiet with --json_out -.")
-                should_print_json_to_console = True
-            else:
-                json_path_out = Path(args_command_list.json_file).absolute()
+        if json_file and not should_print_json_to_console:
+            json_path_out = Path(json_file).absolute()
 
         # Sanity checks on the client cert options
-        client_auth_creds = None
-        if bool(args_command_list.cert) ^ bool(args_command_list.key):
+        client_auth_creds: Optional[ClientAuthenticationCredentials] = None
+        if bool(cert) != bool(key):
             raise CommandLineParsingError("No private key or certificate file were given. See --cert and --key.")
 
-        elif args_command_list.cert:
-            # Private key formats
-            if args_command_list.keyform == "DER":
-                key_type = OpenSslFileTypeEnum.ASN1
-            elif args_command_list.keyform == "PEM":
-                key_type = OpenSslFileTypeEnum.PEM
-            else:
-                raise CommandLineParsingError("--keyform should be DER or PEM.")
-
+        elif cert:
             # Let's try to open the cert and key files
             try:
                 client_auth_creds = ClientAuthenticationCredentials(
-                    certificate_chain_path=Path(args_command_list.cert),
-                    key_path=Path(args_command_list.key),
-                    key_password=args_command_list.keypass,
-                    key_type=key_type,
+                    certificate_chain_path=Path(cert),
+                    key_path=Path(key),
+                    key_password=args_command_list["keypass"],
+                    key_type=_KEY_FORMATS[args_command_list["keyform"]],
                 )
             except ValueError as e:
                 raise CommandLineParsingError("Invalid client authentication settings: {}.".format(e.args[0]))
 
-        # HTTP CONNECT proxy
-        http_proxy_settings = None
-        if args_command_list.https_tunnel:
-            try:
-                http_proxy_settings = HttpProxySettings.from_url(args_command_list.https_tunnel)
-            except ValueError as e:
-                raise CommandLineParsingError("Invalid proxy URL for --https_tunnel: {}.".format(e.args[0]))
+        # Opportunistic TLS; with "auto" the protocol gets derived from each server's port number instead
+        is_starttls_auto = starttls == "auto"
+        opportunistic_tls: Optional[ProtocolWithOpportunisticTlsEnum] = None
+        if starttls and not is_starttls_auto:
+            opportunistic_tls = _STARTTLS_PROTOCOLS_BY_NAME[starttls]
+
+        # Network settings that are the same for all the servers
+        sni: Optional[str] = args_command_list["sni"]
+        xmpp_to: Optional[str] = args_command_list["xmpp_to"]
 
         # Create the server location objects for each specified servers
         good_servers: List[Tuple[ServerNetworkLocation, ServerNetworkConfiguration]] = []
@@ -260,24 +266,17 @@ def parse_command_line(self) -> ParsedCommandLine:
                         continue
 
             # Figure out extra network config for this server
-            # Opportunistic TLS
-            opportunistic_tls: Optional[ProtocolWithOpportunisticTlsEnum] = None
-            if args_command_list.starttls:
-                if args_command_list.starttls == "auto":
-                    # Special value to auto-derive the protocol from the port number
-                    opportunistic_tls = ProtocolWithOpportunisticTlsEnum.from_default_port(final_port)
-                elif args_command_list.starttls in _STARTTLS_PROTOCOL_DICT:
-                    opportunistic_tls = _STARTTLS_PROTOCOL_DICT[args_command_list.starttls]
-                else:
-                    raise CommandLineParsingError(self.START_TLS_USAGE)
+            server_opportunistic_tls = opportunistic_tls
+            if is_starttls_auto:
+                # Special value to auto-derive the protocol from the port number
+                server_opportunistic_tls = ProtocolWithOpportunisticTlsEnum.from_default_port(final_port)
 
             try:
-                sni_hostname = args_command_list.sni if args_command_list.sni else hostname
                 network_config = ServerNetworkConfiguration(
-                    tls_opportunistic_encryption=opportunistic_tls,
-                    tls_server_name_indication=sni_hostname,
+                    tls_opportunistic_encryption=server_opportunistic_tls,
+                    tls_server_name_indication=sni if sni else hostname,
                     tls_client_auth_credentials=client_auth_creds,
-                    xmpp_to_hostname=args_command_list.xmpp_to,
+                    xmpp_to_hostname=xmpp_to,
                 )
                 good_servers.append((server_location, network_config))
             except InvalidServerNetworkConfigurationError as e:
@@ -286,10 +285,10 @@ def parse_command_line(self) -> ParsedCommandLine:
         # Figure out global network settings
         concurrent_server_scans_limit = None
         per_server_concurrent_connections_limit = None
-        if args_command_list.https_tunnel:
+        if http_proxy_settings:
             # All the connections will go through a single proxy; only scan one server at a time to not DOS the proxy
             concurrent_server_scans_limit = 1
-        if args_command_list.slow_connection:
+        if args_command_list["slow_connection"]:
             # Go easy on the servers; only open 2 concurrent connections against each server
             per_server_concurrent_connections_limit = 2
 
@@ -298,9 +297,7 @@ def parse_command_line(self) -> ParsedCommandLine:
         scan_commands_extra_arguments: ScanCommandExtraArgumentsDict = {}
         for scan_command in ScanCommandsRepository.get_all_scan_commands():
             cli_connector_cls = ScanCommandsRepository.get_implementation_cls(scan_command).cli_connector_cls
-            is_scan_cmd_enabled, extra_args = cli_connector_cls.find_cli_options_in_command_line(
-                args_command_list.__dict__
-            )
+            is_scan_cmd_enabled, extra_args = cli_connector_cls.find_cli_options_in_command_line(args_command_list)
             if is_scan_cmd_enabled:
                 scan_commands.add(scan_command)
                 if extra_args:
@@ -313,7 +310,7 @@ def parse_command_line(self) -> ParsedCommandLine:
             scan_commands_extra_arguments=scan_commands_extra_arguments,
             should_print_json_to_console=should_print_json_to_console,
             json_path_out=json_path_out,
-            should_disable_console_output=args_command_list.quiet or args_command_list.json_file == "-",
+            should_disable_console_output=quiet or should_print_json_to_console,
             concurrent_server_scans_limit=concurrent_server_scans_limit,
             per_server_concurrent_connections_limit=per_server_concurrent_connections_limit,
         )
@@ -322,8 +319,8 @@ def _add_default_options(self) -> None:
         """Add default command line options to the parser.
         """
         # Updating the trust stores
-        update_stores_group = OptionGroup(self._parser, "Trust stores options", "")
-        update_stores_group.add_option(
+        update_stores_group = self._parser.add_argument_group("Trust stores options", "")
+        update_stores_group.add_argument(
             "--update_trust_stores",
             help="Update the default trust stores used by SSLyze. The latest stores will be downloaded from "
             "https://github.com/nabla-c0d3/trust_stores_observatory. This option is meant to be used separately, "
@@ -331,28 +328,30 @@ def _add_default_options(self) -> None:
             dest="update_trust_stores",
             action="store_true",
         )
-        self._parser.add_option_group(update_stores_group)
 
         # Client certificate options
-        clientcert_group = OptionGroup(self._parser, "Client certificate options", "")
-        clientcert_group.add_option(
+        clientcert_group = self._parser.add_argument_group("Client certificate options", "")
+        clientcert_group.add_argument(
             "--cert",
             help="Client certificate chain filename. The certificates must be in PEM format and must be sorted "
             "starting with the subject's client certificate, followed by intermediate CA certificates if "
             "applicable.",
             dest="cert",
         )
-        clientcert_group.add_option("--key", help="Client private key filename.", dest="key")
-        clientcert_group.add_option(
-            "--keyform", help="Client private key format. DER or PEM (default).", dest="keyform", default="PEM"
+        clientcert_group.add_argument("--key", help="Client private key filename.", dest="key")
+        clientcert_group.add_argument(
+            "--keyform",
+            help="Client private key format. DER or PEM (default).",
+            dest="keyform",
+            choices=_KEY_FORMATS,
+            default="PEM",
         )
-        clientcert_group.add_option("--pass", help="Client private key passphrase.", dest="keypass", default="")
-        self._parser.add_option_group(clientcert_group)
+        clientcert_group.add_argument("--pass", help="Client private key passphrase.", dest="keypass", default="")
 
         # Input / output
-        output_group = OptionGroup(self._parser, "Input and output options", "")
+        output_group = self._parser.add_argument_group("Input and output options", "")
         # JSON output
-        output_group.add_option(
+        output_group.add_argument(
             "--json_out",
             help='Write the scan results as a JSON document to the file JSON_FILE. If JSON_FILE is set to "-", the '
             "JSON output will instead be printed to stdout. The resulting JSON file is a serialized version of "
@@ -362,7 +361,7 @@ def _add_default_options(self) -> None:
             default=None,
         )
         # Read targets from input file
-        output_group.add_option(
+        output_group.add_argument(
             "--targets_in",
             help="Read the list of targets to scan from the file TARGETS_IN. It should contain one host:port per "
             "line.",
@@ -370,18 +369,17 @@ def _add_default_options(self) -> None:
             default=None,
         )
         # No text output
-        output_group.add_option(
+        output_group.add_argument(
             "--quiet",
             action="store_true",
             dest="quiet",
             help="Do not output anything to stdout; useful when using --json_out.",
         )
-        self._parser.add_option_group(output_group)
 
         # Connectivity option group
-        connect_group = OptionGroup(self._parser, "Connectivity options", "")
+        connect_group = self._parser.add_argument_group("Connectivity options", "")
         # Connection speed
-        connect_group.add_option(
+        connect_group.add_argument(
             "--slow_connection",
             help="Greatly reduce the number of concurrent connections initiated by SSLyze. This will make the scans "
             "slower but more reliable if the connection between your host and the server is slow, or if the "
@@ -391,23 +389,25 @@ def _add_default_options(self) -> None:
             dest="slow_connection",
         )
         # HTTP CONNECT Proxy
-        connect_group.add_option(
+        connect_group.add_argument(
             "--https_tunnel",
             help="Tunnel all traffic to the target server(s) through an HTTP CONNECT proxy. HTTP_TUNNEL should be the "
             "proxy's URL: 'http://USER:PW@HOST:PORT/'. For proxies requiring authentication, only Basic "
             "Authentication is supported.",
             dest="https_tunnel",
+            type=_parse_https_tunnel_url,
             default=None,
         )
         # STARTTLS
-        connect_group.add_option(
+        connect_group.add_argument(
             "--starttls",
             help="Perform a StartTLS handshake when connecting to the target server(s). "
             "{}".format(self.START_TLS_USAGE),
             dest="starttls",
+            choices=_STARTTLS_CHOICES,
             default=None,
         )
-        connect_group.add_option(
+        connect_group.add_argument(
             "--xmpp_to",
             help="Optional setting for STARTTLS XMPP. XMPP_TO should be the hostname to be put in the 'to' "
             "attribute of the XMPP stream. Default is the server's hostname.",
@@ -415,14 +415,13 @@ def _add_default_options(self) -> None:
             default=None,
         )
         # Server Name Indication
-        connect_group.add_option(
+        connect_group.add_argument(
             "--sni",
             help="Use Server Name Indication to specify the hostname to connect to.  Will only affect TLS 1.0+ "
             "connections.",
             dest="sni",
             default=None,
         )
-        self._parser.add_option_group(connect_group)
 
     @staticmethod
     def _get_plugin_scan_commands() -> List[OptParseCliOption]:
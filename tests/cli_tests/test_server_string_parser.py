@@ -1,4 +1,6 @@
-from sslyze.cli.command_line.server_string_parser import CommandLineServerStringParser
+import pytest
+
+from sslyze.cli.command_line.server_string_parser import CommandLineServerStringParser, InvalidServerStringError
 
 
 class TestCommandLineServerStringParser:
@@ -57,3 +59,44 @@ def test_ipv6_as_hint_with_port(self):
         assert "www.google.com" == hostname
         assert 443 == port
         assert "2604:5500:c370:e100:15ba:f57b:e10e:50c1" == ip_address
+
+    def test_bad_port(self):
+        server_string = "www.google.com:abc"
+        with pytest.raises(InvalidServerStringError):
+            CommandLineServerStringParser.parse_server_string(server_string)
+
+    @pytest.mark.parametrize("server_string", ["::1", "fe80::1", "2001:db8::1"])
+    def test_ipv6_without_brackets(self, server_string):
+        with pytest.raises(InvalidServerStringError) as e:
+            CommandLineServerStringParser.parse_server_string(server_string)
+        assert CommandLineServerStringParser.SERVER_STRING_ERROR_BAD_IPV6 == e.value.error_message
+
+    def test_ipv6_missing_closing_bracket(self):
+        server_string = "[2604:5500:c370:e100:15ba:f57b:e10e:50c1:443"
+        with pytest.raises(InvalidServerStringError):
+            CommandLineServerStringParser.parse_server_string(server_string)
+
+    def test_ipv6_as_hint_missing_closing_bracket(self):
+        server_string = "www.google.com:443{[2604:5500:c370:e100:15ba:f57b:e10e:50c1}"
+        with pytest.raises(InvalidServerStringError) as e:
+            CommandLineServerStringParser.parse_server_string(server_string)
+        assert CommandLineServerStringParser.SERVER_STRING_ERROR_BAD_IPV6 == e.value.error_message
+        assert server_string == e.value.server_string
+
+    def test_ip_hint_missing_closing_brace(self):
+        server_string = "www.google.com{192.168.2.1"
+        with pytest.raises(InvalidServerStringError) as e:
+            CommandLineServerStringParser.parse_server_string(server_string)
+        assert CommandLineServerStringParser.SERVER_STRING_ERROR_BAD_IP == e.value.error_message
+
+    @pytest.mark.parametrize("server_string", ["www.google.com:443{192.168.2.1}:80", "www.google.com{192.168.2.1}junk"])
+    def test_ip_hint_followed_by_extra_text(self, server_string):
+        with pytest.raises(InvalidServerStringError) as e:
+            CommandLineServerStringParser.parse_server_string(server_string)
+        assert CommandLineServerStringParser.SERVER_STRING_ERROR_BAD_IP == e.value.error_message
+
+    def test_empty_ip_hint(self):
+        server_string = "www.google.com:443{}"
+        with pytest.raises(InvalidServerStringError) as e:
+            CommandLineServerStringParser.parse_server_string(server_string)
+        assert CommandLineServerStringParser.SERVER_STRING_ERROR_BAD_IP == e.value.error_message